@@ -9,6 +9,7 @@ a specific aspect of the voice control system.
 Architecture Overview:
 - config.py: Configuration parameters and constants
 - audio_handler.py: Audio input/output and processing
+- signal_ops.py: Compiled (Numba) signal processing kernels
 - arduino_comm.py: Serial communication with Arduino
 - speech_recognition.py: Voice-to-text conversion
 - speaker_verification.py: Biometric voice authentication  
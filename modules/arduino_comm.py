@@ -8,18 +8,40 @@ IoT devices via serial or Bluetooth connections.
 
 Key responsibilities:
 - Serial port connection initialization and management
-- Command string transmission to Arduino
+- Command string transmission to Arduino on a background writer thread
 - Connection error handling and recovery
 - Graceful connection cleanup and resource management
 """
 
+import logging
+import os
+import queue
 import serial
+import sys
+import threading
 import time
-from modules.config import ARDUINO_PORT, ARDUINO_BAUD
+from modules.config import ARDUINO_PORT, ARDUINO_BAUD, ARDUINO_TX_QUEUE_SIZE, signal_to_command
 
 # Global serial connection object
 ser = None
 
+# Bound write method and connection flag cached at connect time, so sending
+# a command needs no global/property lookups on the serial object
+_write = None
+_connected = False
+
+# Newline-terminated wire encoding of every command the system can emit,
+# built once at import so sending needs no string concatenation or encoding
+_ENCODED = {cmd: (cmd + "\n").encode("ascii") for cmd in set(signal_to_command.values())}
+
+# Encoded commands handed from callers to the serial writer thread, so
+# sending never blocks recognition or verification on the serial port
+_tx_q = queue.Queue(maxsize=ARDUINO_TX_QUEUE_SIZE)
+_writer = None
+_STOP = None  # Sentinel telling the writer thread to exit
+
+logger = logging.getLogger(__name__)
+
 
 def initialize_serial_connection():
     """
@@ -34,14 +56,24 @@ def initialize_serial_connection():
     
     Global Variables Modified:
         ser: Serial connection object set to active connection or None
+        _write: Bound write method of the connection
+        _connected: Connection flag used when sending commands
+        _writer: Serial writer thread started for the connection
     """
-    global ser
+    global ser, _write, _connected, _writer
     
     try:
-        # Establish serial connection with configured parameters
-        ser = serial.Serial(ARDUINO_PORT, ARDUINO_BAUD, timeout=1)
+        # Establish serial connection with configured parameters; a short read
+        # timeout keeps any reads from stalling for long
+        ser = serial.Serial(ARDUINO_PORT, ARDUINO_BAUD, timeout=0.01)
+        lower_latency_timer(ARDUINO_PORT)
+        _write = ser.write
+        _connected = True
         # Allow Arduino time to reset and initialize after connection
         time.sleep(2)
+        
+        _writer = threading.Thread(target=_writer_loop, name="arduino-writer", daemon=True)
+        _writer.start()
         print(f"✅ Arduino connected successfully on {ARDUINO_PORT}")
         return True
         
@@ -49,16 +81,50 @@ def initialize_serial_connection():
         print(f"⚠️ Failed to connect to Arduino: {e}")
         print(f"📝 Will run in simulation mode (commands logged only)")
         ser = None
+        _write = None
+        _connected = False
+        return False
+
+
+def lower_latency_timer(port):
+    """
+    Lower the USB-serial latency timer of an FTDI adapter to 1ms.
+    
+    FTDI chips hold small writes for up to their latency timer (16ms by
+    default) before flushing them over USB. On Linux the timer is exposed in
+    sysfs and can be lowered at runtime. Other adapters (CH340, CP2102) have
+    no such file and are left untouched, as are ports without write access.
+    
+    TODO: On Windows the equivalent is the FTDI driver's LatencyTimer
+    registry value (or the port's Advanced settings in Device Manager).
+    
+    Args:
+        port (str): Serial port path (e.g. "/dev/ttyUSB0")
+    
+    Returns:
+        bool: True if the latency timer was lowered, False otherwise
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    
+    # Resolve udev symlinks such as /dev/serial/by-id/... to the ttyUSB name
+    name = os.path.basename(os.path.realpath(port))
+    try:
+        with open(f"/sys/bus/usb-serial/devices/{name}/latency_timer", "w") as f:
+            f.write("1")
+        return True
+    except OSError:
         return False
 
 
 def send_command_to_arduino(cmd_str):
     """
-    Send ASCII command string to Arduino via serial connection.
+    Queue ASCII command string for transmission to Arduino.
     
-    Transmits command with newline terminator for Arduino parsing.
+    Hands the newline-terminated command to the serial writer thread and
+    returns immediately. If the writer has fallen behind and the queue is
+    full, the oldest pending command is dropped in favour of the newest.
     Handles both real hardware communication and simulation mode.
-    Provides error handling for connection issues during transmission.
     
     Args:
         cmd_str (str): Command string to send (e.g., "forward", "left", "stop")
@@ -68,18 +134,50 @@ def send_command_to_arduino(cmd_str):
         send_command_to_arduino("left")     # Turn robot left  
         send_command_to_arduino("stop")     # Stop robot movement
     """
-    if ser and ser.is_open:
+    if not _connected:
+        # Simulation mode when no hardware connection available
+        logger.info("🔌 (Simulation) Arduino command: %s", cmd_str)
+        return
+    
+    # Command with newline terminator for Arduino parsing
+    payload = _ENCODED.get(cmd_str) or (cmd_str + "\n").encode("ascii")
+    try:
+        _tx_q.put_nowait(payload)
+    except queue.Full:
+        try:
+            dropped = _tx_q.get_nowait()
+            logger.warning("⚠️ Arduino queue full - dropped %s", dropped.decode("ascii").strip())
+        except queue.Empty:
+            pass
+        _tx_q.put_nowait(payload)
+
+
+def _writer_loop():
+    """
+    Write queued commands to the serial port until the stop sentinel arrives.
+    
+    Provides error handling for connection issues during transmission.
+    
+    Global Variables Modified:
+        _connected: Cleared when the serial link fails
+    """
+    global _connected
+    
+    while True:
+        payload = _tx_q.get()
+        if payload is _STOP:
+            break
+        
         try:
-            # Send command with newline terminator for Arduino parsing
-            ser.write((cmd_str + "\n").encode())
-            print(f"📨 Command sent to Arduino: {cmd_str}")
+            _write(payload)
+            logger.info("📨 Command sent to Arduino: %s", payload.decode("ascii").strip())
             
-        except Exception as e:
-            print(f"⚠️ Serial transmission error: {e}")
-            print(f"🔄 Check connection and try again")
-    else:
-        # Simulation mode when no hardware connection available
-        print(f"🔌 (Simulation) Arduino command: {cmd_str}")
+        except OSError as e:
+            # Serial errors (SerialException is an OSError) mean the link is gone
+            _connected = False
+            logger.warning("⚠️ Serial transmission error: %s", e)
+            logger.warning("🔄 Check connection and restart to reconnect")
+            break
 
 
 def close_serial_connection():
@@ -92,8 +190,22 @@ def close_serial_connection():
     
     Global Variables Modified:
         ser: Set to None after closing connection
+        _write, _connected: Cleared
+        _writer: Stopped and cleared
     """
-    global ser
+    global ser, _write, _connected, _writer
+    
+    _connected = False
+    
+    # Let the writer finish pending commands, then stop it
+    if _writer is not None:
+        try:
+            _tx_q.put(_STOP, timeout=1)
+        except queue.Full:
+            pass
+        _writer.join(timeout=2)
+        _writer = None
+    _write = None
     
     if ser and ser.is_open:
         try:
@@ -113,6 +225,8 @@ def is_connected():
         bool: True if serial connection is open and ready, False otherwise
     
     Useful for conditional command sending and connection status checking
-    before attempting communication operations.
+    before attempting communication operations. Reads the cached connection
+    flag, which is set on connect and cleared on close or when the writer
+    thread hits a serial error, instead of querying the port.
     """
-    return ser is not None and ser.is_open
\ No newline at end of file
+    return _connected
\ No newline at end of file
@@ -10,49 +10,146 @@ Key responsibilities:
 - Audio stream capture and callback handling
 - Rolling audio buffer management for pre-roll functionality
 - Audio file writing and format conversion
-- Audio preprocessing (trimming, normalization, resampling)
+- Audio preprocessing (trimming, padding, normalization)
 """
 
+import logging
 import queue
+import threading
+import wave
 import sounddevice as sd
-import soundfile as sf
 import numpy as np
-import librosa
-import os
-from collections import deque
-from modules.config import SAMPLE_RATE, PRE_ROLL_SECONDS, MIN_VERIFY_SECONDS, TRIM_TOP_DB, TARGET_RMS
+import math
+from modules.signal_ops import trim_and_energy
+from modules.utils import as_int16
+from modules.config import (SAMPLE_RATE, CHANNELS, AUDIO_BLOCKSIZE, AUDIO_POOL_SIZE, PRE_ROLL_SAMPLES,
+                            MIN_VERIFY_SECONDS, TRIM_TOP_DB, TARGET_RMS, SILENCE_PEAK_THRESHOLD)
 
-# Global audio queue for inter-thread communication
-audio_q = queue.Queue()
+# Lock-free single-producer/single-consumer ring between the audio callback
+# and the processing thread. Each slot holds one callback block; only the
+# callback advances audio_write_count and only the consumer advances
+# audio_read_count, so under the GIL no lock is needed on the audio path.
+audio_ring = np.empty((AUDIO_POOL_SIZE, AUDIO_BLOCKSIZE * CHANNELS), dtype=np.int16)
+audio_ring_lengths = np.zeros(AUDIO_POOL_SIZE, dtype=np.int64)
+audio_write_count = 0
+audio_read_count = 0
+audio_ready = threading.Event()
 
 # Rolling buffer for pre-roll audio capture
-# Maintains recent audio history before wake word detection
-rolling_chunks = deque()
-rolling_bytes = 0
-max_rolling_bytes = int(SAMPLE_RATE * PRE_ROLL_SECONDS) * 2  # bytes (int16 = 2 bytes/sample)
+# Preallocated int16 ring holding the most recent audio before wake word detection.
+# Appends overwrite the oldest samples in place, so there is no per-chunk trimming
+max_rolling_samples = PRE_ROLL_SAMPLES
+rolling_ring = np.zeros(max_rolling_samples, dtype=np.int16)
+rolling_write_idx = 0
+rolling_filled = 0
 
-# Set to track temporary files for cleanup
-temp_files = set()
+# Minimum verification clip length in samples at SAMPLE_RATE
+min_verify_samples = int(MIN_VERIFY_SECONDS * SAMPLE_RATE)
+
+# Input status flags seen by the audio callback, counted there and reported
+# by the consumer so the real-time thread never does console I/O
+input_status_count = 0
+input_status_reported = 0
+last_input_status = None
+
+logger = logging.getLogger(__name__)
 
 
 def audio_callback(indata, frames, time_info, status):
     """
-    Real-time audio input callback for sounddevice RawInputStream.
+    Real-time audio input callback for sounddevice InputStream.
     
     Called automatically by sounddevice when new audio data is available.
-    Converts incoming audio data to bytes and queues it for processing.
-    Reports any input status issues for debugging audio problems.
+    Copies incoming audio into the next slot of the preallocated ring buffer,
+    keeping the callback allocation-free and lock-free.
+    Input status issues are only recorded here; get_audio_chunk reports them.
     
     Args:
-        indata: Raw audio data as numpy array (int16 format)
+        indata: Audio data as numpy array of shape (frames, channels), int16 format,
+            valid only during the callback
         frames: Number of audio frames in this callback
         time_info: Timing information from audio system
         status: Audio input status flags
     """
+    global audio_write_count, input_status_count, last_input_status
+    
     if status:
-        print("⚠️ Audio input status:", status)
-    # Convert numpy array to bytes and queue for processing
-    audio_q.put(bytes(indata))
+        last_input_status = status
+        input_status_count += 1
+    
+    # Ring full - drop this block rather than overwrite audio not yet consumed
+    if audio_write_count - audio_read_count >= AUDIO_POOL_SIZE:
+        return
+    
+    # Copy into the next ring slot, then publish it by advancing the write count
+    slot = audio_write_count % AUDIO_POOL_SIZE
+    n = frames * CHANNELS
+    audio_ring[slot, :n] = indata.reshape(-1)
+    audio_ring_lengths[slot] = n
+    audio_write_count += 1
+    audio_ready.set()
+
+
+def get_audio_chunk(timeout=None):
+    """
+    Get all captured audio not yet consumed from the audio ring buffer.
+    
+    Drains every published ring slot in one call and joins them into a
+    single chunk, so a consumer that fell behind catches up with one pass
+    of recognition instead of one per callback block. Waits on an event
+    when the ring is empty. Logs any input status flags the callback has
+    recorded since the previous call.
+    
+    Args:
+        timeout (float): Maximum seconds to wait for audio (None blocks forever)
+    
+    Returns:
+        bytes: Raw audio data in int16 format (one or more callback blocks)
+    
+    Raises:
+        queue.Empty: If no audio arrives within timeout
+    """
+    global audio_read_count, input_status_reported
+    
+    status_count = input_status_count
+    if status_count != input_status_reported:
+        logger.warning("⚠️ Audio input status: %s (%d callbacks)",
+                       last_input_status, status_count - input_status_reported)
+        input_status_reported = status_count
+    
+    if audio_read_count == audio_write_count:
+        # Clear then re-check so a block published in between is not missed
+        audio_ready.clear()
+        if audio_read_count == audio_write_count and not audio_ready.wait(timeout):
+            raise queue.Empty
+    
+    # Snapshot the write count; blocks published after this wait for the next call
+    end = audio_write_count
+    slots = [i % AUDIO_POOL_SIZE for i in range(audio_read_count, end)]
+    chunk = b"".join([audio_ring[slot, :audio_ring_lengths[slot]] for slot in slots])
+    audio_read_count = end
+    return chunk
+
+
+def is_silent(chunk, threshold=SILENCE_PEAK_THRESHOLD):
+    """
+    Check whether an audio chunk contains only silence.
+    
+    Uses the peak absolute amplitude of the int16 samples, computed with two
+    vectorized reductions and no temporary array.
+    
+    Args:
+        chunk (bytes): Raw audio data in int16 format
+        threshold (int): Peak amplitude below which the chunk is silent
+    
+    Returns:
+        bool: True if every sample is quieter than threshold
+    """
+    samples = as_int16(chunk)
+    if samples.size == 0:
+        return True
+    # Compare max and -min separately (abs(-32768) overflows int16)
+    return int(samples.max()) < threshold and -int(samples.min()) < threshold
 
 
 def maintain_rolling_buffer(chunk):
@@ -60,121 +157,108 @@ def maintain_rolling_buffer(chunk):
     Maintain rolling audio buffer for pre-roll capture.
     
     Keeps a sliding window of recent audio data to include context before
-    wake word detection. Automatically removes oldest chunks when buffer
-    exceeds maximum size to prevent memory growth.
+    wake word detection. Samples are written into a fixed-size ring buffer,
+    overwriting the oldest audio, so memory use never grows.
     
     Args:
         chunk (bytes): New audio chunk to add to rolling buffer
     """
-    global rolling_chunks, rolling_bytes
+    global rolling_write_idx, rolling_filled
+    
+    size = rolling_ring.size
+    if size == 0:
+        return  # Pre-roll disabled
     
-    rolling_chunks.append(chunk)
-    rolling_bytes += len(chunk)
+    samples = as_int16(chunk)
+    n = samples.size
     
-    # Remove oldest chunks if buffer exceeds maximum size
-    while rolling_bytes > max_rolling_bytes and rolling_chunks:
-        removed = rolling_chunks.popleft()
-        rolling_bytes -= len(removed)
+    # Chunk larger than the ring - keep only its most recent samples
+    if n >= size:
+        rolling_ring[:] = samples[n - size:]
+        rolling_write_idx = 0
+        rolling_filled = size
+        return
+    
+    # Write chunk at the current position, wrapping around the end if needed
+    end = rolling_write_idx + n
+    if end <= size:
+        rolling_ring[rolling_write_idx:end] = samples
+    else:
+        first = size - rolling_write_idx
+        rolling_ring[rolling_write_idx:] = samples[:first]
+        rolling_ring[:n - first] = samples[first:]
+    
+    rolling_write_idx = end % size
+    rolling_filled = min(size, rolling_filled + n)
 
 
-def write_wav_from_bytes(path, bytes_data, samplerate=SAMPLE_RATE):
+def get_pre_roll_audio():
     """
-    Write raw audio bytes to WAV file with proper formatting.
+    Get the buffered pre-roll audio in chronological order.
     
-    Converts byte array to numpy int16 array and saves as standard WAV file.
-    Registers file for cleanup tracking to prevent temporary file accumulation.
+    Returns:
+        numpy.ndarray: int16 samples from the rolling buffer, oldest first
+            (empty if nothing has been buffered yet)
+    """
+    if rolling_filled < rolling_ring.size:
+        # Ring has not wrapped yet - data starts at index 0
+        return rolling_ring[:rolling_filled].copy()
+    return np.concatenate((rolling_ring[rolling_write_idx:], rolling_ring[:rolling_write_idx]))
+
+
+def clear_rolling_buffer():
+    """
+    Discard all buffered pre-roll audio.
+    """
+    global rolling_write_idx, rolling_filled
+    
+    rolling_write_idx = 0
+    rolling_filled = 0
+
+
+def write_fixed_wav(path, pcm_bytes, samplerate=SAMPLE_RATE):
+    """
+    Write capture-format audio straight to a WAV file.
+    
+    Captured audio is already mono 16-bit PCM at SAMPLE_RATE, so it needs
+    no conversion: the file is just a WAV header followed by the raw bytes,
+    written with the standard library's wave module.
     
     Args:
         path (str): Output file path for WAV file
-        bytes_data (bytes): Raw audio data in int16 format
+        pcm_bytes (bytes-like): Raw mono int16 audio data
         samplerate (int): Audio sample rate for WAV header
     """
-    # Convert bytes to numpy array and write WAV file
-    arr = np.frombuffer(bytes_data, dtype=np.int16)
-    sf.write(path, arr, samplerate, subtype='PCM_16')
-    temp_files.add(path)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(samplerate)
+        wav.writeframes(pcm_bytes)
 
 
-def fix_audio_format(src_path, dst_path, target_sr=SAMPLE_RATE, min_dur=MIN_VERIFY_SECONDS,
-                     trim_silence=True, top_db=TRIM_TOP_DB, target_rms=TARGET_RMS):
+def process_capture(pcm):
     """
-    Normalize and process audio file for speaker verification.
+    Prepare a live microphone capture for speaker verification.
     
-    Performs comprehensive audio preprocessing including resampling,
-    silence trimming, duration padding, and RMS normalization.
-    Ensures consistent audio format for reliable speaker verification.
+    Trims silence, pads to the minimum verification length and normalizes
+    RMS. Capture audio is always mono int16 at SAMPLE_RATE; trim bounds and
+    energy are computed on the int16 samples directly, so only the retained
+    span is converted to float and the int16 scale is folded into the gain.
     
     Args:
-        src_path (str): Source audio file path
-        dst_path (str): Destination processed audio file path
-        target_sr (int): Target sample rate
-        min_dur (float): Minimum duration in seconds (pads with silence)
-        trim_silence (bool): Whether to trim leading/trailing silence
-        top_db (float): Silence threshold for trimming
-        target_rms (float): Target RMS level for normalization
+        pcm (numpy.ndarray): Captured mono int16 samples at SAMPLE_RATE
     
     Returns:
-        str: Path to processed audio file
-    
-    Raises:
-        FileNotFoundError: If source file doesn't exist
+        numpy.ndarray: Trimmed, padded and RMS-normalized float32 audio
     """
-    if not os.path.exists(src_path):
-        raise FileNotFoundError(src_path)
+    start, end, sum_sq = trim_and_energy(pcm, True, TRIM_TOP_DB, 2048, 512)
+    y = pcm[start:end].astype(np.float32)
     
-    # Load and resample audio
-    y, sr = librosa.load(src_path, sr=None, mono=True)
-    if sr != target_sr:
-        y = librosa.resample(y, orig_sr=sr, target_sr=target_sr)
-        sr = target_sr
+    if y.size < min_verify_samples:
+        left = (min_verify_samples - y.size) // 2
+        padded = np.zeros(min_verify_samples, dtype=np.float32)
+        padded[left:left + y.size] = y
+        y = padded
     
-    # Trim silence if requested
-    if trim_silence:
-        y_trimmed, _ = librosa.effects.trim(y, top_db=top_db)
-    else:
-        y_trimmed = y
-    
-    # Pad to minimum duration if necessary
-    cur_dur = len(y_trimmed) / sr
-    if cur_dur < min_dur:
-        need = int((min_dur - cur_dur) * sr)
-        left = need // 2
-        right = need - left
-        y_trimmed = np.concatenate([
-            np.zeros(left, dtype=y_trimmed.dtype),
-            y_trimmed,
-            np.zeros(right, dtype=y_trimmed.dtype)
-        ])
-    
-    # Normalize RMS level
-    def rms(x):
-        return np.sqrt(np.mean(x**2) + 1e-12)
-    
-    cur_r = rms(y_trimmed)
-    if cur_r > 0:
-        y_trimmed = y_trimmed * (target_rms / cur_r)
-    
-    # Write processed audio file
-    sf.write(dst_path, y_trimmed.astype(np.float32), sr, subtype='PCM_16')
-    temp_files.add(dst_path)
-    return dst_path
-
-
-def cleanup_temp_files():
-    """
-    Clean up all temporary audio files created during session.
-    
-    Removes all files tracked in temp_files set and clears the tracking set.
-    Safe cleanup that handles file access errors gracefully.
-    Used during application shutdown to prevent disk space accumulation.
-    """
-    if temp_files:
-        print("🧹 Cleaning up temporary audio files...")
-        for file_path in list(temp_files):
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception:
-                pass  # Ignore cleanup errors
-        temp_files.clear()
-        print("🧹 Audio file cleanup completed.")
\ No newline at end of file
+    y *= TARGET_RMS / math.sqrt(sum_sq / y.size + (32768.0 ** 2) * 1e-12)
+    return y
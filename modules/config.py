@@ -13,34 +13,59 @@ Key configuration categories:
 - Command word to Arduino action mappings
 """
 
+import os
+
 # Audio recording configuration
 # Standard 16kHz mono audio for voice recognition compatibility
 SAMPLE_RATE = 16000
 CHANNELS = 1
+# Frames delivered per audio callback (1600 frames = 100ms at 16kHz)
+# Smaller blocks reach the recognizer sooner, lowering wake word latency
+AUDIO_BLOCKSIZE = 1600
+# Number of callback blocks the audio ring buffer can hold before dropping input
+# (80 blocks = 8s of backlog at 100ms per block)
+AUDIO_POOL_SIZE = 80
 
 # Model and file paths
 # Path to downloaded Vosk speech recognition model directory
 VOSK_MODEL_PATH = "model/model"
 # Reference voice file for speaker verification (user's enrolled voice)
 REF_VOICE = "refVoice.wav"
+# Cached speaker embedding of REF_VOICE (recomputed whenever REF_VOICE is newer).
+# The model and backend are appended to the name, so each combination has its own cache
+REF_EMBEDDING_CACHE = "refVoice_embedding.npy"
+# Restrict Vosk decoding to the wake, end and command words instead of full
+# vocabulary recognition (needs a model with a dynamic graph, e.g. small models)
+RESTRICT_VOCABULARY = True
 
-# Temporary file naming patterns
-# Base names for generated temporary audio files during processing
-AUDIO_TEMP_BASE = "captured_command"
-AUDIO_FIXED_BASE = "captured_fixed"
+# Keep a WAV copy of every capture sent for verification (debugging only;
+# verification itself works entirely in memory)
+SAVE_VERIFICATION_AUDIO = False
+# On-disk directory for those debug copies; they are kept across restarts and
+# never cleaned up automatically, so they must not live in tmpfs
+DEBUG_AUDIO_DIR = "debug_audio"
 
 # Arduino communication settings
 # Serial port and baud rate for Arduino/Bluetooth module communication
 ARDUINO_PORT = "COM5"
 ARDUINO_BAUD = 9600
+# Commands waiting for the serial writer thread (oldest dropped when full)
+ARDUINO_TX_QUEUE_SIZE = 8
 
 # Audio timing parameters (all in seconds)
 # Include some audio before wake word detection to capture complete words
 PRE_ROLL_SECONDS = 0.5
+# Pre-roll buffer capacity derived from the above:
+#   PRE_ROLL_SECONDS * SAMPLE_RATE * CHANNELS int16 samples (0.5s -> 8000 samples,
+#   16000 bytes, i.e. ceil(16000 / (AUDIO_BLOCKSIZE * 2)) = 5 callback blocks)
+# The buffer is a fixed ring of this size, so its memory is bounded regardless of uptime
+PRE_ROLL_SAMPLES = int(PRE_ROLL_SECONDS * SAMPLE_RATE) * CHANNELS
 # Minimum duration for speaker verification (shorter clips are padded)
 MIN_VERIFY_SECONDS = 1.8
 # Minimum duration to accept any captured audio (shorter clips discarded)
 MIN_ACCEPT_SECONDS = 1.5
+# Capacity of the continuous recording buffer (oldest audio is dropped beyond this)
+MAX_RECORD_SECONDS = 30.0
 # Optional buffer after command detection to capture trailing phonemes
 POST_BUFFER_SECONDS = 0.0
 # Gap before allowing new recording after command execution
@@ -53,6 +78,47 @@ TRIGGER_COOLDOWN = 1.0
 TRIM_TOP_DB = 25
 # Target RMS level for audio normalization
 TARGET_RMS = 0.1
+# Peak int16 amplitude below which an audio chunk counts as silence
+SILENCE_PEAK_THRESHOLD = 200
+# While idle, only every Nth silent chunk is fed to the speech recognizer
+# (25 chunks = 2.5s at the default block size)
+SILENT_CHUNK_DECODE_INTERVAL = 25
+
+# Speaker verification parameters
+# RMS level (int16 units) below which a capture is treated as background noise
+# and rejected without running speaker verification
+VERIFY_MIN_RMS = 200
+# Pretrained ECAPA-TDNN model and the local directory its files are kept in
+VERIFY_MODEL_SOURCE = "speechbrain/spkrec-ecapa-voxceleb"
+VERIFY_MODEL_DIR = "pretrained_models/spkrec-ecapa-voxceleb"
+# CPU threads for the verification forward; one core is left for the audio and
+# speech recognition threads so they are not starved during verification
+VERIFY_NUM_THREADS = max(1, (os.cpu_count() or 1) - 1)
+# Cosine similarity above which the speaker is accepted (SpeechBrain default)
+VERIFY_THRESHOLD = 0.25
+# Window for grouping captures into one verification forward pass
+VERIFY_BATCH_WINDOW_SECONDS = 0.05
+# Maximum number of captures verified in one forward pass
+VERIFY_MAX_BATCH = 4
+# Run the ECAPA-TDNN embedding network with ONNX Runtime when on CPU (needs the
+# optional onnxruntime package; falls back to PyTorch if unavailable)
+USE_ONNX_RUNTIME = False
+# Exported embedding network (created on first use; delete to re-export)
+ONNX_MODEL_PATH = "ecapa.onnx"
+# Run the ONNX Runtime embedding network with int8 weights (faster, slightly
+# less accurate - re-check VERIFY_THRESHOLD against your own recordings).
+# Only applies with USE_ONNX_RUNTIME; the PyTorch network stays float32
+QUANTIZE_VERIFICATION_MODEL = False
+# Compile the PyTorch embedding network with torch.compile at startup (slower
+# start while it compiles, faster verification afterwards)
+COMPILE_VERIFICATION_MODEL = False
+
+# Logging parameters
+# Runtime log level; "DEBUG" also shows every partial recognition result
+LOG_LEVEL = "INFO"
+# Maximum log records waiting for the logger thread (extra records are dropped
+# rather than blocking the audio path)
+LOG_QUEUE_SIZE = 1000
 
 # Command word mappings
 # Maps recognized speech to Arduino command strings
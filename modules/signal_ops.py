@@ -0,0 +1,133 @@
+"""
+Compiled signal processing kernels for voice-controlled system.
+
+This module contains the tight per-sample loops of the verification audio
+pipeline, compiled to native code with Numba. Each kernel walks the signal
+once instead of building the temporary arrays that the equivalent numpy
+expressions need. Compiled code is cached on disk, so the JIT cost is only
+paid on the very first run.
+
+Key responsibilities:
+- Prefix-sum signal energy computation
+- Whole-signal energy for the pre-verification energy gate
+- Silence trimming bounds based on framed energy
+- Energy of the retained span for RMS normalization
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def power_prefix_sum(y):
+    """
+    Compute the running sum of squared samples.
+    
+    Args:
+        y (numpy.ndarray): Mono audio signal
+    
+    Returns:
+        numpy.ndarray: float64 array of length len(y) + 1 where element i is
+            the sum of y[:i] ** 2
+    """
+    csum = np.empty(y.size + 1, dtype=np.float64)
+    acc = 0.0
+    csum[0] = 0.0
+    for i in range(y.size):
+        v = np.float64(y[i])
+        acc += v * v
+        csum[i + 1] = acc
+    return csum
+
+
+@njit(cache=True, fastmath=True)
+def sum_squares(y):
+    """
+    Compute the sum of squared samples without a temporary array.
+    
+    Args:
+        y (numpy.ndarray): Mono audio signal
+    
+    Returns:
+        float: Sum of y ** 2 accumulated in float64
+    """
+    acc = 0.0
+    for i in range(y.size):
+        v = np.float64(y[i])
+        acc += v * v
+    return acc
+
+
+@njit(cache=True, fastmath=True)
+def trim_bounds(csum, n, top_db, frame_length, hop_length):
+    """
+    Find the non-silent span of a signal from its power prefix sum.
+    
+    Uses the same framing as librosa.effects.trim: zero-padded frames centred
+    at every hop, keeping the span from the first to the last frame whose
+    mean power is within top_db of the loudest frame.
+    
+    Args:
+        csum (numpy.ndarray): Output of power_prefix_sum for the signal
+        n (int): Number of samples in the signal
+        top_db (float): Threshold in decibels below peak frame power
+        frame_length (int): Analysis frame length in samples
+        hop_length (int): Samples between successive frames
+    
+    Returns:
+        tuple: (start, end) sample indices of the retained span
+    """
+    n_frames = (n + hop_length - 1) // hop_length
+    half = frame_length // 2
+    
+    # Loudest frame power
+    ref = 0.0
+    for f in range(n_frames):
+        center = f * hop_length
+        lo = max(center - half, 0)
+        hi = min(center + half, n)
+        power = (csum[hi] - csum[lo]) / frame_length
+        if power > ref:
+            ref = power
+    
+    if ref <= 0.0:
+        return 0, n  # Digital silence - nothing to compare against
+    
+    # First and last frames above the threshold
+    thresh = ref * 10.0 ** (-top_db / 10.0)
+    first = -1
+    last = -1
+    for f in range(n_frames):
+        center = f * hop_length
+        lo = max(center - half, 0)
+        hi = min(center + half, n)
+        if (csum[hi] - csum[lo]) / frame_length > thresh:
+            if first < 0:
+                first = f
+            last = f
+    
+    return first * hop_length, min(n, (last + 1) * hop_length)
+
+
+@njit(cache=True, fastmath=True)
+def trim_and_energy(y, trim, top_db, frame_length, hop_length):
+    """
+    Trim silence and measure the energy of what remains in one pass.
+    
+    Args:
+        y (numpy.ndarray): Mono audio signal
+        trim (bool): Whether to trim leading/trailing silence
+        top_db (float): Threshold in decibels below peak frame power
+        frame_length (int): Analysis frame length in samples
+        hop_length (int): Samples between successive frames
+    
+    Returns:
+        tuple: (start, end, sum_sq) where y[start:end] is the retained span
+            and sum_sq is the sum of its squared samples
+    """
+    csum = power_prefix_sum(y)
+    if trim:
+        start, end = trim_bounds(csum, y.size, top_db, frame_length, hop_length)
+    else:
+        start, end = 0, y.size
+    return start, end, csum[end] - csum[start]
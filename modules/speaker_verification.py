@@ -10,24 +10,79 @@ Key responsibilities:
 - SpeechBrain speaker verification model initialization
 - Reference voice enrollment and validation
 - Real-time voice authentication against reference
-- Thread-safe verification operations with file locking
+- Lock-free verification of in-memory audio on a single worker thread
 """
 
+import itertools
+import logging
+import math
 import os
+import queue
 import threading
 import time
-import uuid
+import zlib
+import numpy as np
+import torch
+import torch.nn.functional as F
 from speechbrain.inference.speaker import SpeakerRecognition
-from modules.config import REF_VOICE, MIN_ACCEPT_SECONDS, NEXT_RECORD_GAP_SECONDS, AUDIO_TEMP_BASE, AUDIO_FIXED_BASE
-from modules.audio_handler import write_wav_from_bytes, fix_audio_format, temp_files
+from modules.config import (REF_VOICE, REF_EMBEDDING_CACHE, SAMPLE_RATE, MIN_VERIFY_SECONDS, MIN_ACCEPT_SECONDS, NEXT_RECORD_GAP_SECONDS, VERIFY_THRESHOLD,
+                            VERIFY_BATCH_WINDOW_SECONDS, VERIFY_MAX_BATCH, DEBUG_AUDIO_DIR, SAVE_VERIFICATION_AUDIO,
+                            USE_ONNX_RUNTIME, ONNX_MODEL_PATH, QUANTIZE_VERIFICATION_MODEL,
+                            VERIFY_MODEL_SOURCE, VERIFY_MODEL_DIR, VERIFY_NUM_THREADS, VERIFY_MIN_RMS,
+                            COMPILE_VERIFICATION_MODEL)
+from modules.audio_handler import process_capture, write_fixed_wav
+from modules.signal_ops import sum_squares
+from modules.utils import as_int16, audio_duration
 from modules.arduino_comm import send_command_to_arduino
 from modules.config import signal_to_command
 
-# Global verification model and thread safety
+# ONNX Runtime is optional; without it the embedding network runs in PyTorch
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+except ImportError:
+    ort = None
+
+# Global verification model. It is read-only once initialized: forwards run
+# in eval and inference mode and keep no state, so no lock is needed around
+# them. Forwards are serialized by the verification worker thread, the only
+# caller while it runs; next_record_allowed_at is a single float assignment.
 verification = None
-verify_lock = threading.Lock()
+verify_device = "cpu"
 next_record_allowed_at = 0.0
 
+# Embedding of the enrolled reference voice, computed once per session, and
+# its unit-length form so scoring only has to normalize the candidates
+_ref_embedding = None
+_ref_unit = None
+
+# ONNX Runtime session for the embedding network (None runs it in PyTorch)
+ort_session = None
+
+# Short name of the active embedding pipeline (device, precision, runtime),
+# which keys the reference embedding cache
+embedding_backend = "cpu"
+
+# Side stream for verification forwards on CUDA
+_cuda_stream = None
+
+# Per-thread scratch buffer that padded batches are assembled in, allocated
+# once and only regrown for a larger batch (page-locked on CUDA, so the
+# host-to-device copy is asynchronous)
+_scratch = threading.local()
+
+logger = logging.getLogger(__name__)
+
+# Process-unique numbering of saved debug captures (next() is atomic under the GIL)
+_capture_ids = itertools.count()
+
+# Command vocabulary as a set, for C-level membership and disjointness tests
+_cmd_keys = frozenset(signal_to_command)
+
+# Pending captures, verified in micro-batches by a single worker thread
+verify_q = queue.Queue()
+verify_worker = None
+
 
 def initialize_speaker_verification():
     """
@@ -40,17 +95,53 @@ def initialize_speaker_verification():
     Returns:
         bool: True if initialization successful, False if failed
     
+    Runs on CUDA (with float16 autocast) when a GPU is available, otherwise
+    on CPU using VERIFY_NUM_THREADS cores with oneDNN kernels enabled.
+    
     Global Variables Modified:
         verification: SpeechBrain SpeakerRecognition model instance
+        verify_device: Torch device the model runs on
+        embedding_backend: Name of the active embedding pipeline
+        _cuda_stream: CUDA stream used for verification (CUDA only)
     """
-    global verification
+    global verification, verify_device, embedding_backend, _cuda_stream
     
     try:
+        verify_device = "cuda" if torch.cuda.is_available() else "cpu"
+        if verify_device == "cuda":
+            _cuda_stream = torch.cuda.Stream()
+        else:
+            torch.set_num_threads(VERIFY_NUM_THREADS)
+            # Verification runs one forward at a time, so no inter-op pool is needed
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass  # Already fixed once parallel work has started
+            torch.backends.mkldnn.enabled = True
+        
         # Load pre-trained ECAPA-TDNN speaker verification model
         verification = SpeakerRecognition.from_hparams(
-            source="speechbrain/spkrec-ecapa-voxceleb",
+            source=VERIFY_MODEL_SOURCE,
+            savedir=VERIFY_MODEL_DIR,
+            run_opts={"device": verify_device},
         )
-        print("✅ Speaker verification model loaded successfully")
+        # Inference only: keep dropout and batch norm in evaluation mode
+        verification.eval()
+        print(f"✅ Speaker verification model loaded successfully ({verify_device})")
+        
+        onnx_ready = False
+        embedding_backend = "cuda-fp16" if verify_device == "cuda" else "cpu"
+        if verify_device == "cpu":
+            map_embedding_weights()
+            onnx_ready = USE_ONNX_RUNTIME and initialize_onnx_encoder()
+            if onnx_ready:
+                embedding_backend += "-onnx-int8" if QUANTIZE_VERIFICATION_MODEL else "-onnx"
+        if QUANTIZE_VERIFICATION_MODEL and not onnx_ready:
+            # ECAPA-TDNN is all convolutions, which PyTorch's dynamic
+            # quantization does not cover; only ONNX Runtime quantizes them
+            print("⚠️ QUANTIZE_VERIFICATION_MODEL has no effect without ONNX Runtime - using float32")
+        if COMPILE_VERIFICATION_MODEL and not onnx_ready:
+            compile_embedding_model()
         return True
         
     except Exception as e:
@@ -81,125 +172,598 @@ def verify_reference_voice():
     return True
 
 
-def verify_and_execute_commands(captured_audio, matched_words):
+def reference_cache_path():
     """
-    Verify speaker identity and execute commands if authenticated.
+    Get the reference embedding cache file for the current model and backend.
     
-    Processes captured audio through verification pipeline: creates temporary
-    files, performs speaker verification against reference voice, and executes
-    Arduino commands if authentication succeeds. Runs in background thread
-    to avoid blocking main audio processing loop.
+    Embeddings differ slightly between backends (float16 on CUDA, int8
+    quantization, ONNX Runtime) and completely between models, so the
+    backend name and a checksum of VERIFY_MODEL_SOURCE are added to the
+    REF_EMBEDDING_CACHE file name. Changing either makes startup re-enroll
+    the reference voice instead of scoring against a stale embedding.
+    
+    Returns:
+        str: Path of the cache file, e.g. "refVoice_embedding_cpu-onnx_1a2b3c4d.npy"
+    """
+    root, ext = os.path.splitext(REF_EMBEDDING_CACHE)
+    model_id = zlib.crc32(VERIFY_MODEL_SOURCE.encode())
+    return f"{root}_{embedding_backend}_{model_id:08x}{ext}"
+
+
+def load_reference_embedding():
+    """
+    Compute and cache the speaker embedding of the reference voice.
+    
+    The reference recording does not change during a session, so it is
+    encoded once here instead of on every verification. The file is loaded
+    through SpeechBrain's own audio loader, exactly as verify_files did, so
+    any sample rate or channel layout is normalized the same way.
+    
+    The embedding is saved next to REF_EMBEDDING_CACHE, under a name keyed on
+    the model and backend (see reference_cache_path), and reused on later
+    starts as long as the cache is newer than the reference recording, so
+    re-recording the reference voice or switching model or backend
+    automatically invalidates it.
+    
+    Returns:
+        bool: True if embedding computed successfully, False otherwise
+    
+    Global Variables Modified:
+        _ref_embedding: Cached reference embedding tensor
+        _ref_unit: Unit-length reference embedding used for scoring
+    """
+    global _ref_embedding, _ref_unit
+    
+    cache_path = reference_cache_path()
+    
+    try:
+        if (os.path.exists(cache_path)
+                and os.path.getmtime(cache_path) >= os.path.getmtime(REF_VOICE)):
+            _ref_embedding = torch.from_numpy(np.load(cache_path)).to(verify_device)
+            print(f"✅ Reference voice embedding loaded from {cache_path}")
+        else:
+            ref_wav = verification.load_audio(REF_VOICE)
+            _ref_embedding = encode_audio(ref_wav)
+            np.save(cache_path, _ref_embedding.cpu().numpy())
+            print(f"✅ Reference voice embedding cached to {cache_path}")
+        
+        _ref_unit = F.normalize(_ref_embedding, dim=-1)
+        return True
+        
+    except Exception as e:
+        print(f"❌ Failed to compute reference voice embedding: {e}")
+        return False
+
+
+def encode_audio_batch(audios):
+    """
+    Compute speaker embeddings for several in-memory audio signals at once.
+    
+    Signals are zero-padded to the longest one in a reused scratch buffer and
+    passed through ECAPA-TDNN in a single forward, with relative lengths so
+    padding does not affect the embeddings. On CPU a single signal is wrapped
+    as a tensor without copying.
+    On CUDA the network runs under float16 autocast; feature extraction stays
+    in float32 (cuFFT has no half-precision path for the 400-point STFT) and
+    the returned embeddings are always float32. The forward runs under
+    inference mode, so no autograd state is kept. When an ONNX Runtime
+    session is active, only feature extraction runs in PyTorch, and each
+    signal goes through the session on its own, unpadded, since the exported
+    graph takes one signal at a time.
     
     Args:
-        captured_audio (bytes): Raw audio data containing voice command
-        matched_words (list): List of command words detected in audio
+        audios (list): Mono float32 signals (numpy.ndarray or torch.Tensor) at SAMPLE_RATE
+    
+    Returns:
+        torch.Tensor: Embedding tensor of shape (batch, 1, embedding_dim)
+    """
+    on_cuda = verify_device == "cuda"
+    
+    if ort_session is not None:
+        wav_lens = torch.ones(1)
+        embeddings = []
+        with torch.inference_mode():
+            for audio in audios:
+                feats = extract_features(torch.as_tensor(audio).unsqueeze(0), wav_lens)
+                embeddings.append(ort_session.run(None, {"feats": feats.numpy(), "lengths": wav_lens.numpy()})[0])
+        return torch.from_numpy(np.concatenate(embeddings))
+    
+    if len(audios) == 1 and not on_cuda:
+        # Common single-capture case: wrap the signal itself, no padded copy
+        wavs = torch.as_tensor(audios[0]).unsqueeze(0)
+        wav_lens = torch.ones(1)
+    else:
+        lengths = [len(audio) for audio in audios]
+        max_len = max(lengths)
+        wavs = scratch_buffer(len(audios) * max_len, pinned=on_cuda).view(len(audios), max_len)
+        for row, audio, length in zip(wavs, audios, lengths):
+            row[:length].copy_(torch.as_tensor(audio))
+            row[length:].zero_()
+        wav_lens = torch.tensor(lengths, dtype=torch.float32) / max_len
+    
+    if on_cuda:
+        return encode_on_cuda(wavs, wav_lens)
+    
+    # inference_mode skips autograd recording and tensor version tracking
+    with torch.inference_mode():
+        return verification.encode_batch(wavs, wav_lens)
+
+
+def scratch_buffer(numel, pinned=False):
+    """
+    Get the calling thread's float32 scratch buffer with room for numel values.
+    
+    Args:
+        numel (int): Number of values needed
+        pinned (bool): Whether the buffer must be in page-locked memory
+    
+    Returns:
+        torch.Tensor: Contiguous 1-D view of exactly numel values (contents undefined)
+    """
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None or buffer.numel() < numel:
+        buffer = torch.empty(numel, pin_memory=pinned)
+        _scratch.buffer = buffer
+    return buffer[:numel]
+
+
+def encode_on_cuda(wavs, wav_lens):
+    """
+    Run the embedding forward on the GPU from a pinned host batch.
+    
+    The batch is assembled in page-locked scratch memory, so the transfer to
+    the GPU is asynchronous. The transfer and forward are queued on the
+    verification stream, which is synchronized before returning.
+    
+    Args:
+        wavs (torch.Tensor): Batch of signals in pinned memory, shape (batch, samples)
+        wav_lens (torch.Tensor): Relative length of each signal
+    
+    Returns:
+        torch.Tensor: float32 embeddings on the GPU, shape (batch, 1, embedding_dim)
+    """
+    with torch.inference_mode(), torch.cuda.stream(_cuda_stream):
+        wavs = wavs.to(verify_device, non_blocking=True)
+        wav_lens = wav_lens.to(verify_device, non_blocking=True)
+        with torch.autocast(device_type="cuda", dtype=torch.float16):
+            embeddings = verification.encode_batch(wavs, wav_lens)
+        embeddings = embeddings.float()
+    
+    # Results (and the scratch buffer) are only safe to use once the stream is done
+    _cuda_stream.synchronize()
+    return embeddings
+
+
+def extract_features(wavs, wav_lens):
+    """
+    Compute the normalized filterbank features fed to the embedding network.
+    
+    Same steps as the start of SpeechBrain's encode_batch.
+    
+    Args:
+        wavs (torch.Tensor): Batch of signals, shape (batch, samples)
+        wav_lens (torch.Tensor): Relative length of each signal
+    
+    Returns:
+        torch.Tensor: Features of shape (batch, frames, n_mels)
+    """
+    feats = verification.mods.compute_features(wavs.float())
+    return verification.mods.mean_var_norm(feats, wav_lens)
+
+
+def map_embedding_weights():
+    """
+    Back the embedding network's weights with the memory-mapped checkpoint.
+    
+    The weights are reloaded with torch.load(mmap=True) and assigned in
+    place, so they live in the OS page cache instead of private memory.
+    Several processes running the system then share one copy of them, and
+    the pages are only read in as the network touches them. Keeps the
+    already loaded weights if the checkpoint or mmap support is unavailable.
+    
+    Returns:
+        bool: True if the weights are memory-mapped, False otherwise
+    """
+    ckpt_path = os.path.join(VERIFY_MODEL_DIR, "embedding_model.ckpt")
+    try:
+        state = torch.load(ckpt_path, map_location="cpu", mmap=True, weights_only=True)
+        verification.mods.embedding_model.load_state_dict(state, assign=True)
+        return True
+    except (OSError, RuntimeError, TypeError) as e:
+        print(f"⚠️ Speaker model weights not memory-mapped: {e}")
+        return False
+
+
+def compile_embedding_model():
+    """
+    Compile the PyTorch embedding network with torch.compile (Inductor).
+    
+    Compiled with dynamic shapes, since capture lengths vary, in the default
+    mode on every device: CUDA graphs ("reduce-overhead") would record a new
+    graph for each distinct capture length. A warm-up forward on a typical
+    3 second capture triggers compilation here rather than on the first
+    real verification. Falls back to the eager network if compilation fails.
+    
+    Returns:
+        bool: True if the compiled network is in use, False otherwise
     
     Global Variables Modified:
-        next_record_allowed_at: Timestamp when next recording is allowed
+        verification: Embedding network replaced by its compiled version
+    """
+    eager_model = verification.mods.embedding_model
+    
+    try:
+        verification.mods.embedding_model = torch.compile(eager_model, mode="default", dynamic=True)
+        encode_audio(np.zeros(3 * SAMPLE_RATE, dtype=np.float32))
+        print("✅ Speaker embedding network compiled")
+        return True
+    except Exception as e:
+        verification.mods.embedding_model = eager_model
+        print(f"⚠️ torch.compile failed - using eager speaker embedding network: {e}")
+        return False
+
+
+def initialize_onnx_encoder():
+    """
+    Serve the ECAPA-TDNN embedding network with ONNX Runtime on CPU.
     
-    Threading:
-        Designed to run in background thread for non-blocking operation
+    Exports the network to ONNX_MODEL_PATH on first use, then opens it with
+    all graph optimizations (operator fusion, constant folding) enabled. With
+    QUANTIZE_VERIFICATION_MODEL the exported weights, convolutions included,
+    are additionally quantized to int8.
+    
+    The graph is exported for a batch of one signal with a variable number of
+    frames: the attentive pooling mask is built with len(lengths), which the
+    exporter records as a constant, so a batch dimension could not be left
+    dynamic. The session is only kept if its embeddings match PyTorch's on
+    captures whose duration and padding differ from the export example, so
+    any other shape baked into the export falls back to PyTorch instead of
+    changing scores.
+    
+    Returns:
+        bool: True if the ONNX Runtime session is active, False otherwise
+    
+    Global Variables Modified:
+        ort_session: ONNX Runtime inference session or None
     """
-    global next_record_allowed_at
+    global ort_session
+    
+    if ort is None:
+        print("⚠️ onnxruntime not installed - using PyTorch for speaker verification")
+        return False
     
     try:
-        # Check minimum duration requirement
-        captured_dur = len(captured_audio) / (2 * 16000)  # bytes to seconds
-        if captured_dur < MIN_ACCEPT_SECONDS:
-            print(f"⏸️ Audio too short ({captured_dur:.3f}s) - skipping verification")
-            next_record_allowed_at = time.time() + NEXT_RECORD_GAP_SECONDS
-            return
-        
-        # Create unique temporary files for verification
-        uid = uuid.uuid4().hex
-        temp_raw = f"{AUDIO_TEMP_BASE}_{uid}.wav"
-        temp_fixed = f"{AUDIO_FIXED_BASE}_{uid}_fixed.wav"
+        embedding_model = verification.mods.embedding_model
+        export_wavs = torch.randn(1, 2 * SAMPLE_RATE) * 0.1
+        export_lens = torch.ones(1)
+        with torch.inference_mode():
+            export_feats = extract_features(export_wavs, export_lens)
         
-        try:
-            # Save captured audio and process for verification
-            write_wav_from_bytes(temp_raw, captured_audio)
-            fix_audio_format(temp_raw, temp_fixed)
-            print(f"💾 Audio processed for verification: {temp_fixed}")
-            
-            # Perform thread-safe speaker verification
-            with verify_lock:
-                score, prediction = verification.verify_files(REF_VOICE, temp_fixed)
+        if not os.path.exists(ONNX_MODEL_PATH):
+            torch.onnx.export(
+                embedding_model, (export_feats, export_lens), ONNX_MODEL_PATH,
+                input_names=["feats", "lengths"], output_names=["embeddings"],
+                dynamic_axes={"feats": {1: "frames"}},
+                opset_version=17,
+            )
+        
+        model_path = ONNX_MODEL_PATH
+        # int8 embeddings only approximate float32 ones, so they are held to a
+        # looser (cosine similarity) agreement with PyTorch
+        min_agreement = 0.9999
+        if QUANTIZE_VERIFICATION_MODEL:
+            model_path = os.path.splitext(ONNX_MODEL_PATH)[0] + ".int8.onnx"
+            min_agreement = 0.98
+            if not os.path.exists(model_path):
+                quantize_dynamic(ONNX_MODEL_PATH, model_path, weight_type=QuantType.QInt8)
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = VERIFY_NUM_THREADS
+        session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        
+        # Durations unlike the export example: a typical capture, a padded
+        # one, the shortest verified length and a long one
+        checks = [
+            (3.0, [1.0]),
+            (3.2, [0.8]),
+            (MIN_VERIFY_SECONDS, [1.0]),
+            (6.0, [1.0]),
+        ]
+        for seconds, lens in checks:
+            test_wavs = torch.randn(1, int(seconds * SAMPLE_RATE)) * 0.1
+            test_lens = torch.tensor(lens)
+            with torch.inference_mode():
+                test_feats = extract_features(test_wavs, test_lens)
+                expected = embedding_model(test_feats, test_lens)
             
-            # Extract numerical score for logging
+            actual = session.run(None, {"feats": test_feats.numpy(), "lengths": test_lens.numpy()})[0]
+            if actual.shape != tuple(expected.shape):
+                print("⚠️ ONNX embeddings have the wrong shape - using PyTorch for speaker verification")
+                return False
+            agreement = F.cosine_similarity(torch.from_numpy(actual), expected, dim=-1).min().item()
+            if agreement < min_agreement:
+                print("⚠️ ONNX embeddings differ from PyTorch - using PyTorch for speaker verification")
+                return False
+        
+        ort_session = session
+        print(f"✅ Speaker embedding network running on ONNX Runtime ({model_path})")
+        return True
+        
+    except Exception as e:
+        print(f"⚠️ ONNX Runtime setup failed - using PyTorch for speaker verification: {e}")
+        return False
+
+
+def encode_audio(audio):
+    """
+    Compute the speaker embedding of a single in-memory audio signal.
+    
+    Args:
+        audio (numpy.ndarray or torch.Tensor): Mono float32 audio at SAMPLE_RATE
+    
+    Returns:
+        torch.Tensor: Embedding tensor of shape (1, 1, embedding_dim)
+    """
+    return encode_audio_batch([audio])
+
+
+def score_against_reference(audios):
+    """
+    Compare in-memory audio signals against the cached reference embedding.
+    
+    Uses the same decision rule as SpeechBrain's verify_files: cosine
+    similarity between embeddings compared against VERIFY_THRESHOLD. The
+    reference side of the cosine is normalized once at load time, so each
+    score is a dot product with the normalized candidate embedding.
+    
+    Args:
+        audios (list): Processed mono float32 signals at SAMPLE_RATE
+    
+    Returns:
+        tuple: (scores, predictions) tensors with one entry per signal
+    """
+    candidates = encode_audio_batch(audios)
+    with torch.inference_mode():
+        scores = (F.normalize(candidates, dim=-1) * _ref_unit).sum(dim=-1).view(-1)
+        return scores, scores > VERIFY_THRESHOLD
+
+
+def prepare_captured_audio(captured_audio):
+    """
+    Check and preprocess one captured recording for verification.
+    
+    Args:
+        captured_audio (bytes-like): Raw int16 audio data containing voice command
+            (bytes or an int16 sample view from as_int16)
+    
+    Returns:
+        numpy.ndarray: Processed float32 audio, or None if the capture is rejected
+    """
+    pcm = as_int16(captured_audio)
+    
+    # Check minimum duration requirement
+    captured_dur = audio_duration(pcm)
+    if captured_dur < MIN_ACCEPT_SECONDS:
+        logger.info("⏸️ Audio too short (%.3fs) - skipping verification", captured_dur)
+        return None
+    
+    # Quiet captures are background noise that could never authenticate
+    rms = math.sqrt(sum_squares(pcm) / pcm.size)
+    if rms < VERIFY_MIN_RMS:
+        logger.info("⏸️ Audio too quiet (RMS %.0f) - skipping verification", rms)
+        return None
+    
+    if _ref_embedding is None:
+        logger.warning("❌ No reference voice embedding - commands rejected")
+        return None
+    
+    # Optionally keep a copy of the capture for debugging
+    if SAVE_VERIFICATION_AUDIO:
+        os.makedirs(DEBUG_AUDIO_DIR, exist_ok=True)
+        debug_path = os.path.join(DEBUG_AUDIO_DIR, f"captured_command_{os.getpid()}_{next(_capture_ids)}.wav")
+        write_fixed_wav(debug_path, pcm)
+        logger.info("💾 Capture saved for debugging: %s", debug_path)
+    
+    # Trim, pad and normalize the captured int16 audio in memory
+    audio = process_capture(pcm)
+    logger.info("💾 Audio processed for verification (%.2fs)", len(audio) / SAMPLE_RATE)
+    return audio
+
+
+def verify_and_execute_batch(requests):
+    """
+    Verify several captured recordings and execute their commands.
+    
+    All accepted captures are scored in a single ECAPA-TDNN forward, then
+    each capture's commands are executed only if its own score passes.
+    Captures whose words map to no Arduino command are not verified at all.
+    Failures while writing or preprocessing a capture (OSError, ValueError)
+    only drop that capture; a failed forward pass (RuntimeError, which covers
+    CUDA out-of-memory and ONNX Runtime errors) drops the batch. Anything
+    else is a bug and propagates.
+    
+    Args:
+        requests (list): (captured_audio, matched_words) tuples
+    
+    Returns:
+        list: One (score, prediction) tuple per request, in request order,
+            or None for requests rejected before or failing verification
+    
+    Global Variables Modified:
+        next_record_allowed_at: Timestamp when next recording is allowed
+    """
+    global next_record_allowed_at
+    
+    results = [None] * len(requests)
+    
+    try:
+        # Preprocess each capture, dropping those rejected up front
+        pending = []
+        for index, (captured_audio, matched_words) in enumerate(requests):
+            commands = map_commands(matched_words)
+            if not commands:
+                continue  # Nothing would be sent, so skip the forward pass
             try:
-                score_val = score.item()
-            except Exception:
-                score_val = float(score)
-            
-            print(f"📊 Verification score: {score_val:.3f} for commands: {matched_words}")
+                audio = prepare_captured_audio(captured_audio)
+            except (OSError, ValueError):
+                logger.exception("⚠️ Verification processing error")
+                continue
+            if audio is not None:
+                pending.append((index, audio, commands))
+        
+        if not pending:
+            return results
+        
+        # Perform speaker verification for the whole batch in one forward
+        try:
+            scores, predictions = score_against_reference([audio for _, audio, _ in pending])
+        except RuntimeError:
+            logger.exception("❌ Verification error")
+            return results
+        
+        for (index, audio, commands), score, prediction in zip(pending, scores.tolist(), predictions.tolist()):
+            logger.info("📊 Verification score: %.3f for commands: %s", score, commands)
+            results[index] = (score, prediction)
             
             # Execute commands if authentication successful
-            if prediction == 1:
-                print("✅ Speaker authenticated - executing commands")
-                execute_unique_commands(matched_words)
+            if prediction:
+                logger.info("✅ Speaker authenticated - executing commands")
+                execute_unique_commands(commands)
             else:
-                print("❌ Speaker authentication failed - commands rejected")
-                
-        except Exception as e:
-            print(f"⚠️ Verification processing error: {e}")
-            
-        finally:
-            # Clean up temporary files and set next recording delay
-            cleanup_verification_files(temp_raw, temp_fixed)
-            next_record_allowed_at = time.time() + NEXT_RECORD_GAP_SECONDS
-            
-    except Exception as e:
-        print(f"❌ Verification error: {e}")
-        next_record_allowed_at = time.time() + NEXT_RECORD_GAP_SECONDS
+                logger.info("❌ Speaker authentication failed - commands rejected")
+        
+        return results
+        
+    finally:
+        # Set next recording delay
+        next_record_allowed_at = time.monotonic() + NEXT_RECORD_GAP_SECONDS
 
 
-def execute_unique_commands(command_words):
+def submit_verification(captured_audio, matched_words):
     """
-    Execute Arduino commands from verified voice input.
+    Queue a captured recording for verification by the worker thread.
     
-    Maps command words to Arduino actions and sends unique commands only.
-    Prevents duplicate command transmission when multiple instances of
-    same command word are detected in single audio capture.
+    Returns immediately; the worker executes the commands if verification
+    passes.
     
     Args:
-        command_words (list): List of command words to execute
+        captured_audio (bytes-like): Raw audio data containing voice command
+        matched_words (list): List of command words detected in audio
     """
-    executed_commands = set()
+    verify_q.put((captured_audio, matched_words))
+
+
+def verification_worker_loop():
+    """
+    Consume queued captures and verify them in micro-batches.
     
-    for word in command_words:
-        arduino_cmd = signal_to_command.get(word)
-        if arduino_cmd and arduino_cmd not in executed_commands:
-            send_command_to_arduino(arduino_cmd)
-            executed_commands.add(arduino_cmd)
+    Waits for a capture, then collects any further captures arriving within
+    VERIFY_BATCH_WINDOW_SECONDS (up to VERIFY_MAX_BATCH) and verifies them
+    together. Stops when a None sentinel is received.
+    """
+    while True:
+        request = verify_q.get()
+        if request is None:
+            break
+        
+        batch = [request]
+        stop = False
+        deadline = time.monotonic() + VERIFY_BATCH_WINDOW_SECONDS
+        
+        # Drain further captures arriving within the batching window
+        while len(batch) < VERIFY_MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = verify_q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                stop = True
+                break
+            batch.append(request)
+        
+        try:
+            verify_and_execute_batch(batch)
+        except Exception:
+            # Unexpected failure: report it in full but keep the worker alive
+            logger.exception("❌ Unexpected verification failure")
+        
+        if stop:
+            break
 
 
-def cleanup_verification_files(temp_raw, temp_fixed):
+def start_verification_worker():
     """
-    Clean up temporary files created during verification process.
+    Start the background verification worker thread if not running.
     
-    Safely removes temporary audio files and updates global tracking.
-    Handles file access errors gracefully to prevent cleanup failures
-    from affecting system operation.
+    Global Variables Modified:
+        verify_worker: Worker thread instance
+    """
+    global verify_worker
+    
+    if verify_worker is None or not verify_worker.is_alive():
+        verify_worker = threading.Thread(target=verification_worker_loop, daemon=True)
+        verify_worker.start()
+
+
+def stop_verification_worker(timeout=2.0):
+    """
+    Signal the verification worker to stop and wait for it to finish.
     
     Args:
-        temp_raw (str): Path to raw temporary audio file
-        temp_fixed (str): Path to processed temporary audio file  
+        timeout (float): Maximum seconds to wait for the worker thread
     """
-    for file_path in [temp_raw, temp_fixed]:
-        if file_path:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    temp_files.discard(file_path)
-            except Exception:
-                pass  # Ignore cleanup errors
+    if verify_worker is not None and verify_worker.is_alive():
+        verify_q.put(None)
+        verify_worker.join(timeout)
+
+
+def map_commands(command_words):
+    """
+    Map command words to the unique Arduino commands they trigger.
+    
+    Prevents duplicate command transmission when several command words in
+    a single audio capture map to the same Arduino action.
+    
+    Args:
+        command_words (list): Command words detected in audio
+    
+    Returns:
+        list: Unique Arduino command strings in order of first occurrence
+    
+    Examples:
+        map_commands(["on", "turn", "left"]) -> ["forward", "left"]
+    """
+    # One set operation rejects captures without any command word
+    if _cmd_keys.isdisjoint(command_words):
+        return []
+    
+    lookup = signal_to_command
+    return list(dict.fromkeys(lookup[word] for word in command_words if word in _cmd_keys))
+
+
+def execute_unique_commands(commands):
+    """
+    Execute Arduino commands from verified voice input.
+    
+    Args:
+        commands (list): Unique Arduino command strings from map_commands
+    """
+    for arduino_cmd in commands:
+        send_command_to_arduino(arduino_cmd)
 
 
 def can_record_now():
     """
     Check if new audio recording is allowed based on timing constraints.
     
+    Uses the monotonic clock, so system clock adjustments can't shorten or
+    extend the gap.
+    
     Returns:
         bool: True if recording allowed now, False if in cooldown period
     """
-    return time.time() >= next_record_allowed_at
\ No newline at end of file
+    return time.monotonic() >= next_record_allowed_at
\ No newline at end of file
@@ -17,12 +17,29 @@ import json
 import os
 import sys
 from vosk import Model, KaldiRecognizer
-from modules.config import VOSK_MODEL_PATH, SAMPLE_RATE, WAKE_WORD, END_WORD, signal_to_command
+from modules.config import (VOSK_MODEL_PATH, SAMPLE_RATE, WAKE_WORD, END_WORD, RESTRICT_VOCABULARY,
+                            signal_to_command)
+
+# orjson parses the small Vosk result objects several times faster than the
+# standard library; it is optional and only used when a result can't be sliced
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 # Global speech recognition objects
 model = None
 recognizer = None
 
+# Command vocabulary as a set for C-level membership tests
+_COMMAND_WORDS = frozenset(signal_to_command)
+
+# Top-level field markers in Vosk's result JSON, e.g. '"text" : "turn left"'.
+# Vosk writes these after the per-word "result" array, so they are searched
+# from the end of the string
+_TEXT_KEY = '"text" :'
+_PARTIAL_KEY = '"partial" :'
+
 
 def initialize_speech_recognition():
     """
@@ -32,6 +49,10 @@ def initialize_speech_recognition():
     a recognizer instance for processing audio streams. Validates model
     availability and exits gracefully if model files are missing.
     
+    With RESTRICT_VOCABULARY enabled the recognizer is given a grammar of
+    just the wake, end and command words, so Kaldi searches a tiny decoding
+    graph instead of the full language model.
+    
     Returns:
         bool: True if initialization successful, False if failed
     
@@ -50,7 +71,10 @@ def initialize_speech_recognition():
     try:
         # Initialize Vosk model and recognizer
         model = Model(VOSK_MODEL_PATH)
-        recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+        if RESTRICT_VOCABULARY:
+            recognizer = KaldiRecognizer(model, SAMPLE_RATE, build_grammar())
+        else:
+            recognizer = KaldiRecognizer(model, SAMPLE_RATE)
         recognizer.SetWords(True)  # Enable word-level timing information
         
         print(f"✅ Speech recognition initialized with model: {VOSK_MODEL_PATH}")
@@ -61,13 +85,54 @@ def initialize_speech_recognition():
         return False
 
 
+def build_grammar():
+    """
+    Build the Vosk grammar covering every word the system reacts to.
+    
+    Returns:
+        str: JSON list of wake, end and command words plus "[unk]" so that
+            out-of-vocabulary speech is not forced onto a keyword
+    """
+    words = sorted({WAKE_WORD, END_WORD, *signal_to_command})
+    return json.dumps(words + ["[unk]"])
+
+
+def extract_result_field(result, key, field):
+    """
+    Extract a single string field from a Vosk result without a full JSON parse.
+    
+    Vosk results are small JSON objects whose recognized text never contains
+    quotes, so the value is simply the next quoted string after the key.
+    The top-level field is the last member of the object, after any per-word
+    entries added by SetWords(True), so the key is located with rfind.
+    Falls back to a full JSON parse (orjson when installed) if the result
+    does not have the expected shape.
+    
+    Args:
+        result (str): JSON string returned by Result() or PartialResult()
+        key (str): Quoted key and colon to search for (e.g. '"text" :')
+        field (str): Plain field name for the json fallback (e.g. "text")
+    
+    Returns:
+        str: Lowercased field value (empty string if absent)
+    """
+    i = result.rfind(key)
+    if i != -1:
+        start = result.find('"', i + len(key)) + 1
+        end = result.find('"', start)
+        if start and end != -1:
+            return result[start:end].lower()
+    return _json_loads(result).get(field, "").lower()
+
+
 def process_audio_chunk(chunk):
     """
     Process audio chunk through speech recognition engine.
     
     Feeds audio data to Vosk recognizer and returns both final and partial
     recognition results. Handles JSON parsing of recognition results and
-    extracts spoken text for further command processing.
+    extracts spoken text for further command processing. The text field is
+    sliced straight out of the result string rather than parsing the JSON.
     
     Args:
         chunk (bytes): Raw audio data chunk in int16 format
@@ -86,70 +151,72 @@ def process_audio_chunk(chunk):
     # Process audio chunk and get recognition results
     if recognizer.AcceptWaveform(chunk):
         # Final recognition result available
-        res = json.loads(recognizer.Result())
-        final_text = res.get("text", "").lower()
+        final_text = extract_result_field(recognizer.Result(), _TEXT_KEY, "text")
         partial_text = ""
     else:
         # Only partial recognition available
-        pres = json.loads(recognizer.PartialResult()) 
         final_text = ""
-        partial_text = pres.get("partial", "").lower()
+        partial_text = extract_result_field(recognizer.PartialResult(), _PARTIAL_KEY, "partial")
     
     return final_text, partial_text
 
 
-def extract_command_words(text):
+def extract_command_words(tokens):
     """
-    Extract valid command words from recognized speech text.
+    Extract valid command words from recognized speech tokens.
     
-    Filters recognized text to find words that match configured command
+    Filters recognized words to find those that match configured command
     vocabulary. Removes duplicates while preserving order of first occurrence.
     Only returns words that have corresponding Arduino actions defined.
     
     Args:
-        text (str): Recognized speech text (should be lowercase)
+        tokens (list): Recognized speech split into lowercase words
     
     Returns:
-        list: List of unique command words found in text, in order of appearance
+        list: List of unique command words found in tokens, in order of appearance
     
     Examples:
-        extract_command_words("turn left now") -> ["left"]
-        extract_command_words("go forward and stop") -> ["forward", "stop"]
+        extract_command_words(["turn", "left", "now"]) -> ["turn", "left"]
+        extract_command_words(["go", "forward", "and", "stop"]) -> ["forward", "stop"]
     """
-    if not text:
+    # Most utterances contain no command word, which a single set operation
+    # detects without a per-word Python loop
+    commands = _COMMAND_WORDS
+    if commands.isdisjoint(tokens):
         return []
     
-    # Split text into words and filter for command vocabulary
-    words = text.split()
-    matched_words = [word for word in words if word in signal_to_command]
-    
-    # Remove duplicates while preserving order
-    unique_commands = list(dict.fromkeys(matched_words))
-    
-    return unique_commands
+    # Filter for command vocabulary in one pass, removing duplicates while
+    # preserving order
+    seen = set()
+    matched = []
+    for word in tokens:
+        if word in commands and word not in seen:
+            seen.add(word)
+            matched.append(word)
+    return matched
 
 
-def contains_wake_word(text):
+def contains_wake_word(tokens):
     """
-    Check if recognized text contains the wake word.
+    Check if recognized speech contains the wake word.
     
     Args:
-        text (str): Recognized speech text to check
+        tokens (frozenset): Set of recognized words to check
     
     Returns:
-        bool: True if wake word found in text, False otherwise
+        bool: True if wake word found in tokens, False otherwise
     """
-    return WAKE_WORD in text.split() if text else False
+    return WAKE_WORD in tokens
 
 
-def contains_end_word(text):
+def contains_end_word(tokens):
     """
-    Check if recognized text contains the end word.
+    Check if recognized speech contains the end word.
     
     Args:
-        text (str): Recognized speech text to check
+        tokens (frozenset): Set of recognized words to check
     
     Returns:
-        bool: True if end word found in text, False otherwise
+        bool: True if end word found in tokens, False otherwise
     """
-    return END_WORD in text.split() if text else False
\ No newline at end of file
+    return END_WORD in tokens
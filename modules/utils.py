@@ -10,30 +10,107 @@ Key responsibilities:
 - Command cooldown and debouncing logic
 - Timing utilities and timestamp management  
 - Thread-safe state tracking for command triggers
+- Asynchronous logging so console output never blocks the audio path
 - Helper functions for system-wide operations
 """
 
+import logging
+import logging.handlers
+import queue
 import time
 import threading
-from modules.config import TRIGGER_COOLDOWN
+import numpy as np
+from modules.config import TRIGGER_COOLDOWN, SAMPLE_RATE, LOG_LEVEL, LOG_QUEUE_SIZE
 
 # Thread-safe tracking of last command trigger times
 last_trigger_time = {}
 trigger_lock = threading.Lock()
+# Last trigger time of commands that have never fired
+_NEVER = float("-inf")
+
+# Background listener writing queued log records to the console
+log_listener = None
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that drops records instead of failing when the queue is full.
+    
+    Keeps logging calls non-blocking on the audio path even if the console
+    falls behind; a burst of messages loses its tail rather than stalling
+    speech recognition. Records are queued unformatted: the queue never
+    leaves the process, so QueueHandler's formatting into a picklable record
+    is skipped and left to the console handler on the listener thread.
+    """
+    
+    def prepare(self, record):
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging(level=LOG_LEVEL):
+    """
+    Route all logging through a bounded queue to a dedicated writer thread.
+    
+    Callers only pay for putting a record on the queue; formatting the
+    message and writing to the console happen on the listener thread.
+    Safe to call more than once.
+    
+    Args:
+        level (str or int): Root logger level (e.g. "INFO", "DEBUG")
+    
+    Global Variables Modified:
+        log_listener: Started QueueListener instance
+    """
+    global log_listener
+    
+    if log_listener is not None:
+        return
+    
+    log_q = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(message)s"))
+    
+    root = logging.getLogger()
+    root.handlers[:] = [DroppingQueueHandler(log_q)]
+    root.setLevel(level)
+    
+    log_listener = logging.handlers.QueueListener(log_q, console)
+    log_listener.start()
+
+
+def stop_logging():
+    """
+    Flush queued log records and stop the logger thread.
+    
+    Global Variables Modified:
+        log_listener: Set to None after stopping
+    """
+    global log_listener
+    
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
 
 
 def get_current_timestamp():
     """
-    Get current system timestamp in seconds.
+    Get current monotonic timestamp in seconds.
     
     Provides consistent timestamp source across the application for timing
-    operations, cooldown calculations, and event logging. Uses system time
-    for high precision timing measurements.
+    operations and cooldown calculations. Uses the monotonic clock, which is
+    cheaper to read than wall-clock time and never jumps when the system
+    clock is adjusted, so cooldowns can't be skipped or stretched.
     
     Returns:
-        float: Current timestamp in seconds since epoch
+        float: Monotonic timestamp in seconds (only differences are meaningful)
     """
-    return time.time()
+    return time.monotonic()
 
 
 def should_trigger_command(command_word):
@@ -51,22 +128,10 @@ def should_trigger_command(command_word):
         bool: True if command should trigger, False if in cooldown period
     
     Thread Safety:
-        Uses thread lock to ensure atomic read-modify-write operations
-        on trigger time tracking dictionary.
+        Delegates to filter_allowed_commands, which performs the atomic
+        read-modify-write on the trigger time tracking dictionary.
     """
-    current_time = get_current_timestamp()
-    
-    with trigger_lock:
-        # Get last trigger time for this command (default to 0 if new)
-        last_time = last_trigger_time.get(command_word, 0)
-        
-        # Check if enough time has passed since last trigger
-        if current_time - last_time < TRIGGER_COOLDOWN:
-            return False  # Still in cooldown period
-        
-        # Update last trigger time and allow command
-        last_trigger_time[command_word] = current_time
-        return True
+    return bool(filter_allowed_commands([command_word]))
 
 
 def filter_allowed_commands(command_words):
@@ -75,7 +140,8 @@ def filter_allowed_commands(command_words):
     
     Takes list of detected command words and returns only those that pass
     cooldown checking. Maintains original order of commands while filtering
-    out those that are still in their cooldown period.
+    out those that are still in their cooldown period. The whole batch is
+    checked and recorded under a single lock acquisition with one timestamp.
     
     Args:
         command_words (list): List of command words to filter
@@ -86,11 +152,22 @@ def filter_allowed_commands(command_words):
     Examples:
         filter_allowed_commands(["left", "right", "left"]) 
         # -> ["left", "right"] (second "left" filtered by cooldown)
+    
+    Thread Safety:
+        Uses thread lock to ensure atomic read-modify-write operations
+        on trigger time tracking dictionary.
     """
+    current_time = get_current_timestamp()
     allowed_commands = []
     
-    for command in command_words:
-        if should_trigger_command(command):
+    with trigger_lock:
+        for command in command_words:
+            # Check if enough time has passed since last trigger (never if new)
+            if current_time - last_trigger_time.get(command, _NEVER) < TRIGGER_COOLDOWN:
+                continue  # Still in cooldown period
+            
+            # Update last trigger time and allow command
+            last_trigger_time[command] = current_time
             allowed_commands.append(command)
     
     return allowed_commands
@@ -114,39 +191,53 @@ def get_command_cooldown_status():
     Get current cooldown status for all tracked commands.
     
     Returns dictionary showing remaining cooldown time for each command.
-    Useful for debugging timing issues and monitoring system state.
+    Useful for debugging timing issues and monitoring system state. All
+    commands are measured against a single timestamp taken up front.
     
     Returns:
         dict: Command names mapped to remaining cooldown seconds (0 if ready)
+    
+    Thread Safety:
+        Reads a snapshot of the tracking dictionary without taking the lock;
+        dict.copy() is atomic under the GIL, so only writers need the lock.
     """
     current_time = get_current_timestamp()
-    status = {}
-    
-    with trigger_lock:
-        for command, last_time in last_trigger_time.items():
-            remaining = max(0, TRIGGER_COOLDOWN - (current_time - last_time))
-            status[command] = remaining
+    snapshot = last_trigger_time.copy()
     
-    return status
+    return {command: max(0, TRIGGER_COOLDOWN - (current_time - last_time))
+            for command, last_time in snapshot.items()}
 
 
-def calculate_audio_duration_seconds(audio_bytes, sample_rate=16000, bytes_per_sample=2):
+def as_int16(audio_bytes):
     """
-    Calculate duration of audio data in seconds.
+    View raw audio data as an int16 sample array without copying.
+    
+    Shared by duration checks, silence detection and verification so that
+    each works on the same zero-copy view of the captured bytes.
+    
+    Args:
+        audio_bytes (bytes-like): Raw int16 audio data (bytes, bytearray,
+            memoryview or an existing int16 array)
     
-    Converts byte length to duration based on audio format parameters.
-    Assumes standard 16-bit (2 bytes per sample) mono audio format.
+    Returns:
+        numpy.ndarray: int16 view sharing memory with the input; writable
+            only if the input buffer is (e.g. bytearray, not bytes)
+    """
+    return np.frombuffer(audio_bytes, dtype=np.int16)
+
+
+def audio_duration(samples, sample_rate=SAMPLE_RATE):
+    """
+    Calculate duration of an int16 sample view in seconds.
     
     Args:
-        audio_bytes (bytes): Raw audio data
+        samples (numpy.ndarray): Mono audio samples (e.g. from as_int16)
         sample_rate (int): Audio sample rate in Hz
-        bytes_per_sample (int): Bytes per audio sample (2 for 16-bit)
     
     Returns:
         float: Audio duration in seconds
     """
-    num_samples = len(audio_bytes) // bytes_per_sample
-    return num_samples / sample_rate
+    return samples.shape[0] / sample_rate
 
 
 def format_duration(seconds):
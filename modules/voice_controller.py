@@ -8,32 +8,54 @@ and inter-module communication for seamless voice control operation.
 
 Key responsibilities:
 - System initialization and component coordination
-- Main audio processing loop with state management
+- Audio buffering loop and speech recognition loop on separate threads
 - Wake word detection and continuous recording control
 - Command processing pipeline orchestration
 - Graceful system shutdown and resource cleanup
 """
 
+import logging
+import queue
 import threading
 import time
 import sounddevice as sd
 from collections import deque
 
 # Import all required modules
-from modules.config import SAMPLE_RATE, CHANNELS, WAKE_WORD, END_WORD, POST_BUFFER_SECONDS
-from modules.audio_handler import audio_callback, maintain_rolling_buffer, rolling_chunks, audio_q
+from modules.config import (SAMPLE_RATE, CHANNELS, AUDIO_BLOCKSIZE, WAKE_WORD, END_WORD, POST_BUFFER_SECONDS,
+                            MAX_RECORD_SECONDS, SILENT_CHUNK_DECODE_INTERVAL)
+from modules.audio_handler import (audio_callback, maintain_rolling_buffer, get_pre_roll_audio,
+                                   clear_rolling_buffer, get_audio_chunk, is_silent)
 from modules.arduino_comm import initialize_serial_connection, close_serial_connection
 from modules.speech_recognition import (initialize_speech_recognition, process_audio_chunk, 
                                extract_command_words, contains_wake_word, contains_end_word)
 from modules.speaker_verification import (initialize_speaker_verification, verify_reference_voice,
-                                 verify_and_execute_commands, can_record_now)
-from modules.utils import filter_allowed_commands, calculate_audio_duration_seconds
+                                 load_reference_embedding, submit_verification, can_record_now,
+                                 start_verification_worker, stop_verification_worker)
+from modules.utils import filter_allowed_commands, as_int16, audio_duration, setup_logging, stop_logging
+
+# Messages on the audio processing path go through logging, which hands them
+# to a background thread instead of writing to the console inline
+logger = logging.getLogger(__name__)
 
 # Global system state variables
 is_recording = False
-recording_buffer = bytearray()
 stop_all = False
 
+# Continuous recording kept as the list of received chunks (referenced, not
+# copied) and joined once when handed to verification; recording_len is the
+# total number of bytes held
+RECORDING_CAP = int(MAX_RECORD_SECONDS * SAMPLE_RATE) * 2  # bytes (int16 = 2 bytes/sample)
+recording_chunks = deque()
+recording_len = 0
+
+# The audio loop (buffering) and the recognition loop (decoding and state
+# changes) run on separate threads. Chunks pass from one to the other through
+# decode_q, and recording_lock guards the recording state and audio buffers
+# they share.
+decode_q = queue.Queue()
+recording_lock = threading.Lock()
+
 
 def initialize_system():
     """
@@ -62,7 +84,7 @@ def initialize_system():
         return False
     
     # Validate reference voice availability
-    ref_voice_ready = verify_reference_voice()
+    ref_voice_ready = verify_reference_voice() and load_reference_embedding()
     if not ref_voice_ready:
         print("⚠️ System will run without speaker verification")
     
@@ -76,37 +98,59 @@ def process_speech_and_commands(text_final, text_partial):
     
     Handles state transitions based on wake word and end word detection.
     Processes command words during continuous recording mode and initiates
-    verification and execution pipeline for detected commands.
+    verification and execution pipeline for detected commands. The work is
+    done by the handler for the current state, so each chunk only runs the
+    checks that can matter in that state.
     
     Args:
         text_final (str): Final recognition result from speech engine
         text_partial (str): Partial recognition result from speech engine
-    
-    Global Variables Modified:
-        is_recording: Recording state flag
-        recording_buffer: Audio buffer for continuous recording
     """
-    global is_recording, recording_buffer
-    
-    # Combine final and partial text for comprehensive analysis
-    combined_text = f"{text_final} {text_partial}".strip()
+    # Combine final and partial text and tokenize once for all checks
+    tokens_list = f"{text_final} {text_partial}".split()
+    _handler(tokens_list, frozenset(tokens_list))
+
+
+def _handle_idle(tokens_list, tokens_set):
+    """
+    Handle recognized speech while waiting for the wake word.
     
+    Args:
+        tokens_list (list): Recognized words in spoken order
+        tokens_set (frozenset): The same words as a set for membership tests
+    """
     # Wake word detection - start continuous recording
-    if not is_recording and contains_wake_word(combined_text):
-        if can_record_now():
-            start_continuous_recording()
-        else:
-            print("⏭️ Wake word detected but in cooldown period")
+    if not contains_wake_word(tokens_set):
+        return
     
+    if can_record_now():
+        start_continuous_recording()
+        # Commands spoken in the same utterance as the wake word still count
+        _handle_recording(tokens_list, tokens_set)
+    else:
+        logger.info("⏭️ Wake word detected but in cooldown period")
+
+
+def _handle_recording(tokens_list, tokens_set):
+    """
+    Handle recognized speech during continuous recording.
+    
+    Args:
+        tokens_list (list): Recognized words in spoken order
+        tokens_set (frozenset): The same words as a set for membership tests
+    """
     # Command processing during recording
-    if is_recording:
-        command_words = extract_command_words(combined_text)
-        if command_words:
-            process_detected_commands(command_words)
-        
-        # End word detection - stop continuous recording
-        if contains_end_word(combined_text):
-            stop_continuous_recording()
+    command_words = extract_command_words(tokens_list)
+    if command_words:
+        process_detected_commands(command_words)
+    
+    # End word detection - stop continuous recording
+    if contains_end_word(tokens_set):
+        stop_continuous_recording()
+
+
+# Speech handler for the current state, switched on recording start/stop
+_handler = _handle_idle
 
 
 def start_continuous_recording():
@@ -119,15 +163,45 @@ def start_continuous_recording():
     
     Global Variables Modified:
         is_recording: Set to True
-        recording_buffer: Initialized with pre-roll audio
+        _handler: Switched to the recording-state speech handler
+        recording_chunks, recording_len: Reset to hold only the pre-roll audio
+    """
+    global is_recording, recording_len, _handler
+    
+    with recording_lock:
+        # Include pre-roll audio from rolling buffer
+        pre_roll_audio = get_pre_roll_audio()
+        is_recording = True
+        recording_chunks.clear()
+        recording_len = 0
+        append_to_recording(pre_roll_audio.tobytes())
+    _handler = _handle_recording
+    logger.info("🔔 Wake word detected - continuous recording started with pre-roll")
+
+
+def append_to_recording(audio):
+    """
+    Append an audio chunk to the continuous recording.
+    
+    The chunk object is stored by reference; no audio is copied until the
+    recording is joined for verification. Once more than MAX_RECORD_SECONDS
+    are held, the oldest chunks are dropped.
+    
+    Args:
+        audio (bytes): Raw int16 audio chunk
+    
+    Global Variables Modified:
+        recording_chunks: Chunk appended, oldest chunks dropped on overflow
+        recording_len: Updated total number of bytes held
     """
-    global is_recording, recording_buffer
+    global recording_len
+    
+    recording_chunks.append(audio)
+    recording_len += len(audio)
     
-    # Include pre-roll audio from rolling buffer
-    pre_roll_audio = b"".join(rolling_chunks) if rolling_chunks else b""
-    is_recording = True
-    recording_buffer = bytearray(pre_roll_audio)
-    print("🔔 Wake word detected - continuous recording started with pre-roll")
+    # Drop the oldest audio beyond capacity (always keep the newest chunk)
+    while recording_len > RECORDING_CAP and len(recording_chunks) > 1:
+        recording_len -= len(recording_chunks.popleft())
 
 
 def process_detected_commands(command_words):
@@ -142,9 +216,9 @@ def process_detected_commands(command_words):
         command_words (list): List of detected command words
     
     Global Variables Modified:
-        recording_buffer: Cleared and reinitialized for next command
+        recording_chunks, recording_len: Reset for next command
     """
-    global recording_buffer
+    global recording_len
     
     # Filter commands based on cooldown restrictions
     allowed_commands = filter_allowed_commands(command_words)
@@ -155,23 +229,19 @@ def process_detected_commands(command_words):
     if POST_BUFFER_SECONDS > 0:
         time.sleep(POST_BUFFER_SECONDS)
     
-    # Capture current recording for verification
-    captured_audio = bytes(recording_buffer)
-    audio_duration = calculate_audio_duration_seconds(captured_audio)
+    # Join the recorded chunks once and view them as samples for verification,
+    # then reset the recording buffer for the next command
+    with recording_lock:
+        captured_audio = as_int16(b"".join(recording_chunks))
+        recording_chunks.clear()
+        recording_len = 0
+    captured_dur = audio_duration(captured_audio)
     
-    print(f"⚡ Commands detected: {allowed_commands}")
-    print(f"📊 Captured {audio_duration:.3f}s of audio for verification")
+    logger.info("⚡ Commands detected: %s", allowed_commands)
+    logger.info("📊 Captured %.3fs of audio for verification", captured_dur)
     
-    # Start verification in background thread
-    verification_thread = threading.Thread(
-        target=verify_and_execute_commands,
-        args=(captured_audio, allowed_commands),
-        daemon=True
-    )
-    verification_thread.start()
-    
-    # Reset recording buffer for next command
-    recording_buffer = bytearray()
+    # Hand off to the background verification worker
+    submit_verification(captured_audio, allowed_commands)
 
 
 def stop_continuous_recording():
@@ -184,58 +254,117 @@ def stop_continuous_recording():
     
     Global Variables Modified:
         is_recording: Set to False
-        recording_buffer: Cleared
-        rolling_chunks: Cleared
+        _handler: Switched back to the idle-state speech handler
+        recording_chunks, recording_len: Reset to empty
     """
-    global is_recording, recording_buffer
-    
-    is_recording = False
-    recording_buffer = bytearray()
-    rolling_chunks.clear()
-    print("🛑 End word detected - continuous recording stopped")
+    global is_recording, recording_len, _handler
+    
+    with recording_lock:
+        is_recording = False
+        recording_chunks.clear()
+        recording_len = 0
+        clear_rolling_buffer()
+    _handler = _handle_idle
+    logger.info("🛑 End word detected - continuous recording stopped")
 
 
 def main_audio_processing_loop():
     """
-    Main audio processing loop with speech recognition integration.
+    Main audio buffering loop feeding the speech recognition loop.
     
-    Continuously processes audio chunks from input queue, maintains rolling
-    buffer, feeds speech recognition engine, and orchestrates system state
-    transitions. Runs in dedicated thread for non-blocking operation.
+    Continuously takes audio chunks from the input ring buffer, maintains the
+    rolling buffer and the continuous recording, and queues chunks for speech
+    recognition. Decoding runs on its own thread (recognition_loop), so audio
+    keeps being buffered while the recognizer works on earlier chunks.
+    Runs in dedicated thread for non-blocking operation.
     """
-    print("🎤 Audio processing loop started")
+    logger.info("🎤 Audio processing loop started")
+    silent_chunks = 0
     
     while not stop_all:
         try:
-            # Get audio chunk with timeout to allow clean shutdown
-            chunk = audio_q.get(timeout=1)
-        except:
-            continue  # Timeout or queue empty
+            # Get all pending audio with timeout to allow clean shutdown
+            chunk = get_audio_chunk(timeout=1)
+        except queue.Empty:
+            continue
         
-        # Maintain rolling buffer for pre-roll functionality
-        maintain_rolling_buffer(chunk)
+        with recording_lock:
+            # Maintain rolling buffer for pre-roll functionality
+            maintain_rolling_buffer(chunk)
+            
+            # Add chunk to recording buffer if actively recording
+            recording = is_recording
+            if recording:
+                append_to_recording(chunk)
         
-        # Add chunk to recording buffer if actively recording
-        if is_recording:
-            recording_buffer.extend(chunk)
+        # Skip recognition of prolonged silence while waiting for the wake word.
+        # The first silent chunks after speech are still decoded so the
+        # recognizer can finalize the utterance, then only every Nth one.
+        if not recording and is_silent(chunk):
+            silent_chunks += 1
+            if silent_chunks > SILENT_CHUNK_DECODE_INTERVAL and silent_chunks % SILENT_CHUNK_DECODE_INTERVAL:
+                continue
+        else:
+            silent_chunks = 0
+        
+        decode_q.put(chunk)
+    
+    logger.info("🔚 Audio processing loop terminated")
+
+
+def recognition_loop():
+    """
+    Speech recognition loop running alongside the audio buffering loop.
+    
+    Feeds queued audio to the speech recognition engine and dispatches the
+    results for wake word, command and end word handling. A backlog of
+    queued chunks is decoded as one chunk with one recognizer pass.
+    Runs in dedicated thread for non-blocking operation.
+    """
+    last_partial = ""
+    # Partial results arrive every chunk; only log them when DEBUG is enabled
+    log_partials = logger.isEnabledFor(logging.DEBUG)
+    
+    while not stop_all:
+        try:
+            chunk = decode_q.get(timeout=1)
+        except queue.Empty:
+            continue
+        
+        # Catch up on any chunks queued while the previous one was decoded
+        if not decode_q.empty():
+            pending = [chunk]
+            try:
+                while True:
+                    pending.append(decode_q.get_nowait())
+            except queue.Empty:
+                pass
+            chunk = b"".join(pending)
         
         # Process chunk through speech recognition
         try:
             final_text, partial_text = process_audio_chunk(chunk)
             
+            # Vosk repeats the same partial result until new words are decoded;
+            # an unchanged partial has already been processed
+            if final_text:
+                last_partial = ""
+            elif partial_text == last_partial:
+                continue
+            else:
+                last_partial = partial_text
+            
             # Log recognition results
             if final_text:
-                print(f"→ Final: {final_text}")
-            if partial_text and not final_text:
-                print(f"→ Partial: {partial_text}")
+                logger.info("→ Final: %s", final_text)
+            elif partial_text and log_partials:
+                logger.debug("→ Partial: %s", partial_text)
             
             # Process speech for commands and state changes
             process_speech_and_commands(final_text, partial_text)
             
         except Exception as e:
-            print(f"⚠️ Speech processing error: {e}")
-    
-    print("🔚 Audio processing loop terminated")
+            logger.warning("⚠️ Speech processing error: %s", e)
 
 
 def run_voice_control_system():
@@ -248,23 +377,34 @@ def run_voice_control_system():
     """
     global stop_all
     
+    setup_logging()
+    
     # Initialize all system components
     if not initialize_system():
         print("❌ System initialization failed - exiting")
+        stop_logging()
         return
     
-    # Start audio processing in background thread
+    # Start speaker verification worker
+    start_verification_worker()
+    
+    # Start audio processing and speech recognition in background threads
     processing_thread = threading.Thread(
         target=main_audio_processing_loop, 
         daemon=True
     )
     processing_thread.start()
+    recognition_thread = threading.Thread(
+        target=recognition_loop,
+        daemon=True
+    )
+    recognition_thread.start()
     
     try:
         # Start real-time audio input stream
-        with sd.RawInputStream(
+        with sd.InputStream(
             samplerate=SAMPLE_RATE,
-            blocksize=4000,
+            blocksize=AUDIO_BLOCKSIZE,
             dtype='int16',
             channels=CHANNELS,
             callback=audio_callback
@@ -290,9 +430,9 @@ def shutdown_system():
     """
     Perform graceful system shutdown with resource cleanup.
     
-    Signals all threads to stop, closes hardware connections, cleans up
-    temporary files, and ensures proper resource deallocation. Safe to
-    call multiple times during error conditions.
+    Signals all threads to stop, closes hardware connections, and ensures
+    proper resource deallocation. Safe to call multiple times during error
+    conditions.
     """
     global stop_all
     
@@ -301,15 +441,13 @@ def shutdown_system():
     
     # Allow threads time to finish current operations
     time.sleep(0.5)
+    stop_verification_worker()
     
     # Close hardware connections
     close_serial_connection()
     
-    # Clean up temporary files
-    from modules.audio_handler import cleanup_temp_files
-    cleanup_temp_files()
-    
     print("✅ System shutdown completed successfully")
+    stop_logging()
 
 
 # Module entry point for direct execution